@@ -0,0 +1,345 @@
+# benchmark.py
+"""Drive a full quiz session with simulated players and report per-route latency as JSON
+
+Uploads a generated workbook and waits for its import job, joins N players concurrently,
+polls /quiz_status until the quiz starts, answers every question with /get_question +
+/submit_answer and loads /results.
+By default the app is served in-process by a threaded Werkzeug server on a throwaway
+database; --target points the benchmark at an already running server (e.g. serve.py).
+--results-queries instead counts the SQL queries of one /results page for growing quiz sizes
+and fails unless the count stays the same.
+
+Usage: python benchmark.py [--players 50] [--questions 20] [--bundle 0] [--output results.json]
+       python benchmark.py --results-queries [5 20 80]
+"""
+import argparse
+import http.cookiejar
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+
+def build_workbook(questions):
+    rows = []
+    for i in range(questions):
+        row = {
+            'Quiz Title': 'Benchmark Quiz',
+            'Description': 'Generated by benchmark.py',
+            'Quiz Administrator': 'Benchmark Admin',
+            'Question': f'Question {i + 1}?',
+        }
+        if i % 2 == 0:
+            row.update({'Type': 'MCQ', 'Option A': 'right', 'Option B': 'wrong', 'Option C': 'other', 'Correct Answer': 'right'})
+        else:
+            row.update({'Type': 'fill', 'Correct Answer': 'answer'})
+        rows.append(row)
+    buffer = io.BytesIO()
+    pd.DataFrame(rows).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+class Recorder:
+    """Latency samples and failures per route, shared by every simulated client"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.lock_errors = 0
+        self.answers = 0
+        self._lock = threading.Lock()
+
+    def record(self, route, seconds, status, body):
+        with self._lock:
+            self.samples[route].append(seconds)
+            self.statuses[route][status] += 1
+            if b'database is locked' in body:
+                self.lock_errors += 1
+
+    def answered(self, count):
+        with self._lock:
+            self.answers += count
+
+
+class Client:
+    """HTTP client with its own cookie jar, like one browser"""
+
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+            NoRedirect()
+        )
+
+    def request(self, route, path, data=None, headers=None):
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers or {})
+        start = time.perf_counter()
+        try:
+            with self.opener.open(request, timeout=60) as response:
+                status, body = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, body = e.code, e.read()
+        except (urllib.error.URLError, OSError) as e:
+            status, body = 'connection_error', str(e).encode()
+        self.recorder.record(route, time.perf_counter() - start, status, body)
+        return status, body
+
+    def get_json(self, route, path):
+        status, body = self.request(route, path)
+        return status, json.loads(body) if status == 200 else None
+
+    def post_json(self, route, path, payload):
+        status, body = self.request(route, path, json.dumps(payload).encode(), {'Content-Type': 'application/json'})
+        return status, json.loads(body) if status == 200 else None
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Redirects are recorded as responses of the route that sent them, not followed
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def upload(client, questions):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="excel"; filename="benchmark.xlsx"\r\n'
+        'Content-Type: application/vnd.openxmlformats-officedocument.spreadsheetml.sheet\r\n\r\n'
+    ).encode() + build_workbook(questions) + f'\r\n--{boundary}--\r\n'.encode()
+    status, response = client.request('/upload', '/upload', body, {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+    if status != 202:
+        raise SystemExit(f"Upload failed with {status}: {response[:200]!r}")
+    # The workbook is imported by a background job
+    job_url = json.loads(response)['status_url']
+    while True:
+        _, job = client.get_json('/jobs/<id>', job_url)
+        if job and job['status'] == 'done':
+            return job['result']['quiz_id']
+        if not job or job['status'] == 'failed':
+            raise SystemExit(f"Upload failed: {job and job['error']}")
+        time.sleep(0.1)
+
+
+def answer_for(question):
+    return 'A' if question['type'] == 'mcq' else 'answer'
+
+
+def play(client, quiz_id, username, started, poll_interval, bundle=0):
+    """One player: join, wait for the start by polling, answer everything, load the results
+
+    With a bundle size, questions are fetched that many at a time and answered in one batch.
+    """
+    failures = 0
+    status, _ = client.request('/join/<id>', f'/join/{quiz_id}', urllib.parse.urlencode({'username': username}).encode())
+    if status != 200:
+        return 1
+
+    while not started.is_set():
+        client.get_json('/quiz_status/<id>', f'/quiz_status/{quiz_id}')
+        started.wait(poll_interval)
+    client.get_json('/quiz_status/<id>', f'/quiz_status/{quiz_id}')
+
+    while bundle:
+        status, data = client.get_json('/get_question/<id>', f'/get_question/{quiz_id}?bundle={bundle}')
+        if status != 200:
+            failures += 1
+            break
+        if data.get('status') != 'started':
+            break
+        answers = [{'question_id': question['question_id'], 'answer': answer_for(question)} for question in data['questions']]
+        status, result = client.post_json('/submit_answers/<id>', f'/submit_answers/{quiz_id}', {'answers': answers})
+        if status != 200:
+            failures += 1
+            break
+        client.recorder.answered(len(answers))
+        if result.get('status') == 'finished':
+            break
+
+    while not bundle:
+        status, question = client.get_json('/get_question/<id>', f'/get_question/{quiz_id}')
+        if status != 200:
+            failures += 1
+            break
+        if question.get('status') != 'started':
+            break
+        status, result = client.post_json('/submit_answer/<id>', f'/submit_answer/{quiz_id}',
+                                          {'question_id': question['question_id'], 'answer': answer_for(question)})
+        if status != 200:
+            failures += 1
+            break
+        client.recorder.answered(1)
+        if result.get('status') == 'finished':
+            break
+
+    status, _ = client.request('/results/<id>', f'/results/{quiz_id}')
+    if status != 200:
+        failures += 1
+    return failures
+
+
+def percentile(sorted_samples, fraction):
+    # Nearest-rank percentile
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(recorder, elapsed):
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        samples = sorted(samples)
+        routes[route] = {
+            "requests": len(samples),
+            "throughput_rps": round(len(samples) / elapsed, 2),
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+            "statuses": {str(status): count for status, count in sorted(recorder.statuses[route].items(), key=str)},
+        }
+    return routes
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_local_server():
+    """Serve the app from a thread on a free port, backed by a database in a temporary directory"""
+    workdir = tempfile.mkdtemp(prefix='proquiz-bench-')
+    os.environ['PROQUIZ_DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    os.environ['PROQUIZ_LIVE_STORE'] = 'memory'
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from werkzeug.serving import make_server
+    from app import app, init_db
+
+    with app.app_context():
+        init_db()
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def count_results_queries(question_counts):
+    """SQL queries a player's /results page runs, per quiz size, on the in-process server"""
+    base_url, server = start_local_server()
+    from sqlalchemy import event
+    from app import app, db
+
+    queries = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: queries.append(1))
+
+    recorder = Recorder()
+    admin = Client(base_url, recorder)
+    started = threading.Event()
+    started.set()
+    counts = {}
+    for questions in question_counts:
+        quiz_id = upload(admin, questions)
+        player = Client(base_url, recorder)
+        admin.request('/start_quiz/<id>', f'/start_quiz/{quiz_id}')
+        if play(player, quiz_id, 'player', started, 0):
+            raise SystemExit(f"Playing the {questions} question quiz failed")
+        queries.clear()
+        status, _ = player.request('/results/<id>', f'/results/{quiz_id}')
+        if status != 200:
+            raise SystemExit(f"/results failed with {status}")
+        counts[questions] = len(queries)
+    server.shutdown()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=50)
+    parser.add_argument('--questions', type=int, default=20)
+    parser.add_argument('--threads', type=int, help="concurrent players, defaults to --players")
+    parser.add_argument('--poll-interval', type=float, default=2.0, help="seconds between /quiz_status polls while waiting")
+    parser.add_argument('--wait', type=float, default=3.0, help="seconds players wait in the lobby before the start")
+    parser.add_argument('--bundle', type=int, default=0, help="fetch and answer questions this many at a time")
+    parser.add_argument('--target', help="base URL of a running server instead of an in-process one")
+    parser.add_argument('--output', help="also write the JSON report to this file")
+    parser.add_argument('--results-queries', type=int, nargs='*', metavar='QUESTIONS',
+                        help="count the queries of /results for these quiz sizes (default 5 20 80) instead")
+    args = parser.parse_args()
+    threads = args.threads or args.players
+
+    if args.results_queries is not None:
+        counts = count_results_queries(args.results_queries or [5, 20, 80])
+        print(json.dumps({"commit": git_commit(), "results_queries": counts}, indent=2))
+        if len(set(counts.values())) > 1:
+            sys.exit("/results runs more queries for bigger quizzes")
+        return
+
+    server = None
+    if args.target:
+        base_url = args.target.rstrip('/')
+    else:
+        base_url, server = start_local_server()
+
+    recorder = Recorder()
+    admin = Client(base_url, recorder)
+    quiz_id = upload(admin, args.questions)
+    started = threading.Event()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        players = [
+            pool.submit(play, Client(base_url, recorder), quiz_id, f'player{n}', started, args.poll_interval, args.bundle)
+            for n in range(args.players)
+        ]
+        time.sleep(args.wait)
+        admin.request('/start_quiz/<id>', f'/start_quiz/{quiz_id}')
+        started.set()
+        failures = sum(player.result() for player in players)
+    elapsed = time.perf_counter() - start
+    admin.request('/stop_quiz/<id>', f'/stop_quiz/{quiz_id}')
+    _, rankings = admin.get_json('/rankings/<id>', f'/rankings/{quiz_id}')
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "target": args.target or "in-process werkzeug",
+        "players": args.players,
+        "questions": args.questions,
+        "threads": threads,
+        "bundle": args.bundle,
+        "session_seconds": round(elapsed, 2),
+        # The lobby wait is idle time, so answer throughput is measured over the rest of the session
+        "answers_per_second": round(recorder.answers / max(elapsed - args.wait, 1e-9), 2),
+        "failed_requests": failures,
+        "lock_errors": recorder.lock_errors,
+        # Exactly one player should get the first-finisher bonus
+        "bonuses_awarded": sum(player["bonus"] for player in rankings or []),
+        "routes": summarize(recorder, elapsed),
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    if server:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
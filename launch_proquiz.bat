@@ -3,4 +3,4 @@
 cd /d D:\ProQuiz
 call venv\Scripts\activate
 start "" http://127.0.0.1:5000
-python app.py
\ No newline at end of file
+python serve.py
\ No newline at end of file
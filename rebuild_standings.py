@@ -0,0 +1,16 @@
+# rebuild_standings.py
+"""Recompute the overall standings and the standings history from the quizzes in the database
+
+Run after restoring or editing a database by hand, or to backfill the history of quizzes
+that ended before it was recorded. Result snapshots are discarded and rebuilt on next view.
+"""
+from app import app, db, init_db, invalidate_quiz_snapshot, rebuild_overall_standings, OverallStanding, StandingHistory
+
+if __name__ == "__main__":
+    with app.app_context():
+        init_db()
+        rebuild_overall_standings()
+        # Also rewrites the history of every quiz and commits
+        invalidate_quiz_snapshot()
+        print(f"Overall standings rebuilt for {OverallStanding.query.count()} players.")
+        print(f"Standings history rebuilt with {StandingHistory.query.count()} entries.")
@@ -1,5 +1,5 @@
 # reset_db.py
-from app import app, db
+from app import app, db, init_db
 import os
 
 if __name__ == "__main__":
@@ -7,5 +7,5 @@ if __name__ == "__main__":
         db.session.close()  # close active sessions
         
         # Recreate tables
-        db.create_all()
-        print("New database created.")
\ No newline at end of file
+        init_db()
+        print("New database created.")
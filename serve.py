@@ -0,0 +1,81 @@
+# serve.py
+"""Run ProQuiz on a production server
+
+gunicorn with threaded workers on Linux and macOS, waitress on Windows. Configure with
+PROQUIZ_WORKERS (processes, gunicorn only), PROQUIZ_THREADS (per process) and PROQUIZ_PORT.
+"""
+import logging
+import os
+import sys
+
+WORKERS = int(os.getenv('PROQUIZ_WORKERS', 2))
+# Every open live page (Server-Sent Events) holds a thread for as long as it is open. Half the
+# threads at most go to live pages (PROQUIZ_LIVE_MAX_STREAMS), the other pages poll instead.
+THREADS = int(os.getenv('PROQUIZ_THREADS', 64))
+HOST = os.getenv('PROQUIZ_HOST', '0.0.0.0')
+
+# The app sizes its live stream limit from the thread count
+os.environ.setdefault('PROQUIZ_THREADS', str(THREADS))
+# Worker processes can only see each other's live events through a shared store
+if WORKERS > 1 and sys.platform != 'win32':
+    os.environ.setdefault('PROQUIZ_LIVE_STORE', 'sqlite')
+# /shutdown signals this process, which then stops its workers gracefully
+os.environ['PROQUIZ_SERVER_PID'] = str(os.getpid())
+
+from app import app, db, init_db, live_store, public_address, run_shutdown_hooks, startup_logger, PORT
+
+logger = logging.getLogger(__name__)
+
+
+def run_gunicorn():
+    from gunicorn.app.base import BaseApplication
+
+    def post_fork(server, worker):
+        # Connections opened before the fork must not be shared between workers
+        with app.app_context():
+            db.engine.dispose(close=False)
+
+    def worker_exit(server, worker):
+        run_shutdown_hooks()
+
+    class ProQuizApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{HOST}:{PORT}")
+            self.cfg.set('workers', WORKERS)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('threads', THREADS)
+            self.cfg.set('graceful_timeout', 10)
+            self.cfg.set('post_fork', post_fork)
+            self.cfg.set('worker_exit', worker_exit)
+
+        def load(self):
+            return app
+
+    startup_logger.info(f"Serving on {HOST}:{PORT} with gunicorn, {WORKERS} workers x {THREADS} threads, "
+                        f"live store {type(live_store).__name__}")
+    ProQuizApplication().run()
+
+
+def run_waitress():
+    from waitress import serve
+
+    startup_logger.info(f"Serving on {HOST}:{PORT} with waitress, {THREADS} threads")
+    try:
+        serve(app, host=HOST, port=PORT, threads=THREADS)
+    finally:
+        run_shutdown_hooks()
+
+
+if __name__ == '__main__':
+    if WORKERS > 1 and not live_store.shared and sys.platform != 'win32':
+        sys.exit("PROQUIZ_LIVE_STORE=memory only works with PROQUIZ_WORKERS=1")
+
+    with app.app_context():
+        init_db()
+        db.engine.dispose()
+    startup_logger.info(f"Players join at {public_address.url}")
+
+    if sys.platform == 'win32':
+        run_waitress()
+    else:
+        run_gunicorn()
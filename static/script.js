@@ -54,6 +54,23 @@ const api = {
     }
 };
 
+// Slow operations run as background jobs: poll a job until it has finished
+const jobs = {
+    async wait(statusUrl, onProgress, interval = 1000) {
+        while (true) {
+            const job = await api.fetch(statusUrl);
+            if (job.status === 'done') return job.result;
+            if (job.status === 'failed') {
+                const error = new Error(job.error || 'Job failed');
+                error.job = job;
+                throw error;
+            }
+            if (onProgress && job.progress) onProgress(job.progress);
+            await new Promise(resolve => setTimeout(resolve, interval));
+        }
+    }
+};
+
 // Common UI utilities
 const ui = {
     showLoading(show = true) {
@@ -105,6 +122,29 @@ const quiz = {
     }
 };
 
+// Live quiz updates pushed by the server, with polling as a fallback
+const live = {
+    subscribe(quizId, handlers, fallback) {
+        if (!window.EventSource) {
+            if (fallback) fallback();
+            return null;
+        }
+
+        const source = new EventSource(`/events/${quizId}`);
+        Object.entries(handlers).forEach(([event, handler]) => {
+            source.addEventListener(event, e => handler(JSON.parse(e.data)));
+        });
+        source.onerror = () => {
+            // The browser reconnects on its own unless the channel is refused outright
+            if (source.readyState === EventSource.CLOSED && fallback) {
+                console.error('Live channel closed, falling back to polling');
+                fallback();
+            }
+        };
+        return source;
+    }
+};
+
 // Page visibility handling
 const pageVisibility = {
     callbacks: [],
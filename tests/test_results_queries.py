@@ -0,0 +1,106 @@
+"""The SQL queries behind a player's /results page must not grow with the number of questions"""
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    # Read when the app module is imported, so set before it is
+    os.environ['PROQUIZ_DATABASE_URL'] = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    os.environ['PROQUIZ_LIVE_STORE'] = 'memory'
+    import app as proquiz
+
+    proquiz.app.config['TESTING'] = True
+    with proquiz.app.app_context():
+        proquiz.init_db()
+    return proquiz
+
+
+@pytest.fixture()
+def queries(app):
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    with app.app.app_context():
+        engine = app.db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', count)
+
+
+def build_workbook(questions):
+    rows = []
+    for i in range(questions):
+        row = {
+            'Quiz Title': f'Quiz of {questions}',
+            'Description': 'Results query count',
+            'Quiz Administrator': 'Admin',
+            'Question': f'Question {i + 1}?',
+        }
+        if i % 2 == 0:
+            row.update({'Type': 'MCQ', 'Option A': 'right', 'Option B': 'wrong', 'Correct Answer': 'right'})
+        else:
+            row.update({'Type': 'fill', 'Correct Answer': 'answer'})
+        rows.append(row)
+    buffer = io.BytesIO()
+    pd.DataFrame(rows).to_excel(buffer, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+def upload(client, questions):
+    response = client.post('/upload', data={'excel': (build_workbook(questions), 'quiz.xlsx')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 202, response.data
+    status_url = response.get_json()['status_url']
+    for _ in range(200):
+        job = client.get(status_url).get_json()
+        if job['status'] == 'done':
+            return job['result']['quiz_id']
+        assert job['status'] != 'failed', job['error']
+        time.sleep(0.05)
+    pytest.fail(f"Uploading a {questions} question quiz did not finish")
+
+
+def play(app, questions):
+    """Upload a quiz, answer all of it as one player and return the admin and player clients"""
+    admin = app.app.test_client()
+    quiz_id = upload(admin, questions)
+    player = app.app.test_client()
+    assert player.post(f'/join/{quiz_id}', data={'username': f'player{questions}'}).status_code == 200
+    admin.get(f'/start_quiz/{quiz_id}')
+    while True:
+        question = player.get(f'/get_question/{quiz_id}').get_json()
+        assert question.get('status') == 'started', question
+        answer = 'right' if question['type'] == 'mcq' else 'answer'
+        result = player.post(f'/submit_answer/{quiz_id}',
+                             json={'question_id': question['question_id'], 'answer': answer}).get_json()
+        if result.get('status') == 'finished':
+            return quiz_id, admin, player
+
+
+def results_queries(queries, player, quiz_id):
+    queries.clear()
+    assert player.get(f'/results/{quiz_id}').status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize('ended', [False, True], ids=['live', 'ended'])
+def test_results_queries_do_not_grow_with_questions(app, queries, ended):
+    counts = {}
+    for questions in (5, 80):
+        quiz_id, admin, player = play(app, questions)
+        if ended:
+            admin.get(f'/stop_quiz/{quiz_id}')
+        counts[questions] = results_queries(queries, player, quiz_id)
+    assert counts[5] == counts[80], counts